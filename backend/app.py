@@ -1,30 +1,24 @@
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
-from tensorflow.keras.models import load_model
 import numpy as np
 import cv2
 import mediapipe as mp
 import tempfile
 import io
-from collections import deque
 from PIL import Image
 from passlib.context import CryptContext
 from sqlalchemy import create_engine, Column, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from jose import jwt
-from datetime import datetime, timedelta
 from fastapi import FastAPI, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from google.oauth2 import id_token
-from google.auth.transport import requests as grequests
 import os
 import tensorflow as tf
+from session_store import create_session_store, SEQUENCE_LENGTH
+from auth import create_access_token, get_current_user, verify_google_id_token
 
 
-GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
-
 app = FastAPI()
 
 app.add_middleware(
@@ -67,9 +61,6 @@ def get_db():
     finally:
         db.close()
 
-SECRET_KEY = os.getenv("SECRET_KEY", "fallback_secret_key")
-ALGORITHM = "HS256"
-
 
 @app.post("/signup")
 def signup(user: dict, db: Session = Depends(get_db)):
@@ -89,7 +80,7 @@ def signup(user: dict, db: Session = Depends(get_db)):
     db.refresh(new_user)
 
     # ✅ Return token + username (auto-login)
-    access_token = "dummy_token_123"
+    access_token = create_access_token(new_user.id, new_user.username)
 
     return {
         "message": "Signup successful",
@@ -105,7 +96,7 @@ def login(user: dict, db: Session = Depends(get_db)):
     if not db_user or not pwd_context.verify(user["password"], db_user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    access_token = "dummy_token_123"
+    access_token = create_access_token(db_user.id, db_user.username)
 
     return {
         "message": "Login successful",
@@ -117,18 +108,40 @@ def login(user: dict, db: Session = Depends(get_db)):
 # model = load_model("best_finetuned_modelpart2.keras")
 # actions = np.array(['hello', 'thanks', 'iloveyou', 'yes', 'no'])
 
-# Load the TensorFlow Lite model
-interpreter = tf.lite.Interpreter(model_path="model_optimized.tflite")
-interpreter.allocate_tensors()
-
-# Get input and output tensor details
-input_details = interpreter.get_input_details()
-output_details = interpreter.get_output_details()
+# TensorFlow Lite model (set MODEL_PATH=model_student.tflite to serve the distilled student)
+MODEL_PATH = os.getenv("MODEL_PATH", "model_optimized.tflite")
+# Interpreter threads per worker (unset = TFLite default); training_utils.benchmark_tflite reads the same var
+TFLITE_NUM_THREADS = int(os.environ["TFLITE_NUM_THREADS"]) if os.getenv("TFLITE_NUM_THREADS") else None
 
 actions = np.array(['hello', 'thanks', 'iloveyou', 'yes', 'no'])
 
+# The interpreter and the MediaPipe graph are NOT shared between workers: the graph runs its
+# own threads and cannot survive a fork, and the interpreter's buffers (including XNNPACK's
+# repacked weights) are per-process. Both are created lazily once per worker (keyed on the
+# pid). What `gunicorn -c gunicorn.conf.py` shares is the preloaded TF/MediaPipe libraries
+# and Python heap (copy-on-write).
+_process_local = {}
+
+
+def get_process_local(name, factory):
+    pid = os.getpid()
+    if _process_local.get("pid") != pid:
+        _process_local.clear()
+        _process_local["pid"] = pid
+    if name not in _process_local:
+        _process_local[name] = factory()
+    return _process_local[name]
+
+
+def _load_interpreter():
+    interpreter = tf.lite.Interpreter(model_path=MODEL_PATH, num_threads=TFLITE_NUM_THREADS)
+    interpreter.allocate_tensors()
+    return interpreter, interpreter.get_input_details(), interpreter.get_output_details()
+
+
 # Function to run inference with TFLite
 def predict_with_tflite(sequence):
+    interpreter, input_details, output_details = get_process_local("interpreter", _load_interpreter)
     input_data = np.array(sequence, dtype=np.float32)
     interpreter.set_tensor(input_details[0]['index'], input_data)
     interpreter.invoke()
@@ -137,8 +150,11 @@ def predict_with_tflite(sequence):
 
 
 mp_holistic = mp.solutions.holistic
-sequence_buffer = deque(maxlen=30)
-SINGLE_FRAME_MODE = True
+# Per-client keypoint windows; shared across workers when SESSION_STORE_URL points at Redis
+session_store = create_session_store()
+# The frontend sends one frame every 5 s, so a 30-frame window would span minutes; keep
+# single-frame prediction as the default until the capture rate is raised, then set SINGLE_FRAME_MODE=0
+SINGLE_FRAME_MODE = os.getenv("SINGLE_FRAME_MODE", "1") == "1"
 
 
 def mediapipe_detection(image, model):
@@ -158,8 +174,15 @@ def extract_keypoints(results):
     
     return np.concatenate([pose, face, lh, rh])
 
+def _load_holistic():
+    # Every upload to /predict/ and /visualize/ is an independent frame, so a single
+    # static-image graph per worker serves both instead of one graph per request
+    return mp_holistic.Holistic(static_image_mode=True, min_detection_confidence=0.5,
+                                min_tracking_confidence=0.5)
+
 @app.post("/predict/")
-async def predict(file: UploadFile = File(...)):
+async def predict(file: UploadFile = File(...), x_session_id: str | None = Header(default=None),
+                  current_user: dict = Depends(get_current_user)):
     with tempfile.NamedTemporaryFile(delete=False) as tmp:
         tmp.write(await file.read())
         tmp_path = tmp.name
@@ -168,30 +191,40 @@ async def predict(file: UploadFile = File(...)):
     if frame is None:
         return {"error": "Could not read image."}
 
-    with mp_holistic.Holistic(min_detection_confidence=0.5,
-                              min_tracking_confidence=0.5) as holistic:
-        results = mediapipe_detection(frame, holistic)
-        keypoints = extract_keypoints(results)
-        sequence = np.expand_dims([keypoints] * 30, axis=0)
-
-        # yhat = model.predict(sequence, verbose=0)
-        # predicted_class = actions[np.argmax(yhat)]
-        # confidence = float(np.max(yhat))
-
-        yhat = predict_with_tflite(sequence)
-        predicted_class = actions[np.argmax(yhat)]
-        confidence = float(np.max(yhat))
-
+    holistic = get_process_local("holistic", _load_holistic)
+    results = mediapipe_detection(frame, holistic)
+    keypoints = extract_keypoints(results)
+
+    if SINGLE_FRAME_MODE or not x_session_id:
+        sequence = np.expand_dims([keypoints] * SEQUENCE_LENGTH, axis=0)
+    else:
+        # Namespaced by the verified user, so a client can't write into another user's window
+        window = session_store.append(f"{current_user['sub']}:{x_session_id}", keypoints)
+        # Until the window fills up, pad the front with the oldest frame we have
+        if len(window) < SEQUENCE_LENGTH:
+            pad = np.repeat(window[:1], SEQUENCE_LENGTH - len(window), axis=0)
+            window = np.concatenate([pad, window])
+        sequence = np.expand_dims(window, axis=0)
+
+    # yhat = model.predict(sequence, verbose=0)
+    # predicted_class = actions[np.argmax(yhat)]
+    # confidence = float(np.max(yhat))
+
+    yhat = predict_with_tflite(sequence)
+    predicted_class = actions[np.argmax(yhat)]
+    confidence = float(np.max(yhat))
 
     return {"prediction": predicted_class, "confidence": confidence}
 
 mp_drawing = mp.solutions.drawing_utils
-holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
 
 @app.post("/visualize/")
-async def visualize_keypoints(file: UploadFile = File(...)):
+async def visualize_keypoints(file: UploadFile = File(...), current_user: dict = Depends(get_current_user)):
     image = Image.open(file.file).convert("RGB")
     img_array = np.array(image)
+    holistic = get_process_local("holistic", _load_holistic)
     results = holistic.process(img_array)
     annotated_image = img_array.copy()
 
@@ -221,17 +254,23 @@ async def visualize_keypoints(file: UploadFile = File(...)):
 @app.post("/auth/google")
 def google_auth(user: dict, db: Session = Depends(get_db)):
     try:
-        email = user.get("email")
-        name = user.get("name")
-        print("📨 Received from frontend:", user)
+        credential = user.get("credential")
+        if not credential:
+            raise HTTPException(status_code=400, detail="Google credential missing")
 
-        if not email:
-            raise HTTPException(status_code=400, detail="Email missing from Google auth")
+        # Email and name come from the verified ID token, never from the request body
+        claims = verify_google_id_token(credential)
+        email = claims["email"]
+        name = claims.get("name") or email.split("@")[0]
 
         existing_user = db.query(User).filter(User.email == email).first()
         if existing_user:
             print("✅ Existing user login:", existing_user.username)
-            return {"message": "Login successful", "user": existing_user.username}
+            return {
+                "message": "Login successful",
+                "access_token": create_access_token(existing_user.id, existing_user.username),
+                "user": existing_user.username,
+            }
 
         new_user = User(username=name, email=email, password="google_login")
         db.add(new_user)
@@ -239,8 +278,14 @@ def google_auth(user: dict, db: Session = Depends(get_db)):
         db.refresh(new_user)
 
         print("🆕 Created new Google user:", new_user.username)
-        return {"message": "Signup successful via Google", "user": new_user.username}
-
+        return {
+            "message": "Signup successful via Google",
+            "access_token": create_access_token(new_user.id, new_user.username),
+            "user": new_user.username,
+        }
+
+    except HTTPException:
+        raise
     except Exception as e:
         print("Google Auth error:", e)
         raise HTTPException(status_code=401, detail="Google login failed")
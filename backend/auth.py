@@ -0,0 +1,158 @@
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import requests
+from fastapi import Header, HTTPException
+from jose import jwt, JWTError
+
+SECRET_KEY = os.getenv("SECRET_KEY")
+if not SECRET_KEY:
+    if os.getenv("AUTH_DEV_MODE") != "1":
+        raise RuntimeError("SECRET_KEY is not set. Set it (see README) or use AUTH_DEV_MODE=1 for local development.")
+    # Random per-process key: tokens stop working on restart and aren't valid across workers
+    SECRET_KEY = secrets.token_urlsafe(32)
+    print("⚠️ AUTH_DEV_MODE: using a random SECRET_KEY for this process only")
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
+
+GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+# Point at a saved JWKS file (e.g. for offline tests) instead of fetching Google's keys
+GOOGLE_JWKS_FILE = os.getenv("GOOGLE_JWKS_FILE")
+
+
+# ===============================
+# Access tokens (issued by us, HS256)
+# ===============================
+def create_access_token(user_id, username, expires_minutes=ACCESS_TOKEN_EXPIRE_MINUTES):
+    expire = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
+    claims = {"sub": str(user_id), "username": username, "exp": expire}
+    return jwt.encode(claims, SECRET_KEY, algorithm=ALGORITHM)
+
+
+class TokenCache:
+    """Remembers already-verified tokens until they expire, so repeat frames skip the HMAC check."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # token -> claims
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        with self._lock:
+            claims = self._entries.get(token)
+            if claims is None:
+                return None
+            if claims.get("exp", 0) <= time.time():
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return claims
+
+    def put(self, token, claims):
+        with self._lock:
+            self._entries[token] = claims
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+token_cache = TokenCache()
+
+
+def verify_access_token(token):
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    token_cache.put(token, claims)
+    return claims
+
+
+def get_current_user(authorization: str | None = Header(default=None)):
+    # Verified entirely in-process: no database round-trip per frame
+    if not authorization or not authorization.lower().startswith("bearer "):
+        raise HTTPException(status_code=401, detail="Missing bearer token",
+                            headers={"WWW-Authenticate": "Bearer"})
+    return verify_access_token(authorization.split(" ", 1)[1].strip())
+
+
+# ===============================
+# Google ID tokens (RS256, keys from Google's JWKS)
+# ===============================
+class GoogleKeySet:
+    """Caches Google's signing keys, refreshing when they expire or an unknown key id shows up."""
+
+    def __init__(self, url=GOOGLE_CERTS_URL, path=GOOGLE_JWKS_FILE, default_ttl=3600, min_refresh_interval=60):
+        self.url = url
+        self.path = path
+        self.default_ttl = default_ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self.path:
+            with open(self.path) as f:
+                return json.load(f), self.default_ttl
+
+        response = requests.get(self.url, timeout=5)
+        response.raise_for_status()
+        ttl = self.default_ttl
+        for directive in response.headers.get("Cache-Control", "").split(","):
+            name, _, value = directive.strip().partition("=")
+            if name == "max-age" and value.isdigit():
+                ttl = int(value)
+        return response.json(), ttl
+
+    def refresh(self):
+        jwks, ttl = self._load()
+        now = time.time()
+        self._keys = {key["kid"]: key for key in jwks.get("keys", [])}
+        self._fetched_at = now
+        self._expires_at = now + ttl
+
+    def get(self, kid):
+        with self._lock:
+            now = time.time()
+            if now >= self._expires_at:
+                self.refresh()
+            elif kid not in self._keys and now - self._fetched_at >= self.min_refresh_interval:
+                # Google rotated its keys before our cached copy expired
+                self.refresh()
+            return self._keys.get(kid)
+
+
+google_keys = GoogleKeySet()
+
+
+def verify_google_id_token(credential):
+    try:
+        kid = jwt.get_unverified_header(credential).get("kid")
+        try:
+            key = google_keys.get(kid)
+        except (requests.RequestException, OSError, ValueError):
+            raise HTTPException(status_code=503, detail="Could not load Google signing keys")
+        if key is None:
+            raise HTTPException(status_code=401, detail="Unknown Google signing key")
+        claims = jwt.decode(credential, key, algorithms=["RS256"], audience=GOOGLE_CLIENT_ID,
+                            options={"verify_at_hash": False})
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid Google ID token")
+
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise HTTPException(status_code=401, detail="Invalid Google ID token issuer")
+    if not claims.get("email") or not claims.get("email_verified", False):
+        raise HTTPException(status_code=401, detail="Google account email is not verified")
+    return claims
@@ -0,0 +1,193 @@
+import os
+import numpy as np
+from tensorflow.keras.models import Model, load_model
+from tensorflow.keras.layers import Dense, Dropout, GRU, Input, Lambda, DepthwiseConv1D, Conv1D, GlobalAveragePooling1D
+from tensorflow.keras.callbacks import EarlyStopping
+import tensorflow as tf
+from training_utils import ACTIONS, TEST_SPLIT_PATH, load_dataset, split_dataset, benchmark_tflite
+
+# ===============================
+# Distillation config
+# ===============================
+TEACHER_PATH = os.getenv("TEACHER_PATH", "best_finetuned_model.keras")
+STUDENT_PATH = "model/student_gesture_model.keras"
+STUDENT_TFLITE_PATH = "model_student.tflite"
+TEACHER_TFLITE_PATH = "model_optimized.tflite"
+
+TEMPERATURE = 4.0   # softens the teacher's output distribution
+ALPHA = 0.1         # weight of the hard-label loss, the rest goes to the soft targets
+STUDENT_TYPE = os.getenv("STUDENT_TYPE", "gru")  # "gru" or "dwconv"
+
+# Keypoint layout from extract_keypoints(): pose (33*4), face (468*3), lh (21*3), rh (21*3)
+POSE_SIZE, FACE_SIZE, HAND_SIZE = 33 * 4, 468 * 3, 21 * 3
+# The student drops the face mesh and only looks at pose + both hands (258 of 1662 features)
+STUDENT_FEATURES = np.concatenate([
+    np.arange(0, POSE_SIZE),
+    np.arange(POSE_SIZE + FACE_SIZE, POSE_SIZE + FACE_SIZE + 2 * HAND_SIZE),
+]).astype(np.int32)
+
+# ===============================
+# Load dataset
+# ===============================
+actions = ACTIONS
+X, y, ids = load_dataset(actions)
+
+# Score the teacher (and validate the student) only on sequences the teacher never trained on
+X_train, X_test, y_train, y_test, held_out = split_dataset(X, y, ids)
+if held_out:
+    print(f"✅ Using train_model.py's held-out test split ({TEST_SPLIT_PATH})")
+else:
+    print(f"⚠️ {TEST_SPLIT_PATH} not found: the teacher has likely seen part of this test set, "
+          "so its accuracy below is optimistic. Retrain with train_model.py to save the split.")
+
+# ===============================
+# Teacher soft targets
+# ===============================
+teacher = load_model(TEACHER_PATH)
+print(f"✅ Teacher loaded from {TEACHER_PATH}")
+
+
+def soft_targets(probs, temperature):
+    # The teacher ends in a softmax, so re-temper its probabilities through their logs
+    logits = np.log(np.clip(probs, 1e-8, 1.0)) / temperature
+    logits -= logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+teacher_train = teacher.predict(X_train, batch_size=64, verbose=0)
+teacher_test = teacher.predict(X_test, batch_size=64, verbose=0)
+soft_train = soft_targets(teacher_train, TEMPERATURE).astype(np.float32)
+soft_test = soft_targets(teacher_test, TEMPERATURE).astype(np.float32)
+
+# ===============================
+# Student model
+# ===============================
+input_shape = (30, 1662)
+
+
+def build_student(num_classes):
+    # Input stays (30, 1662) so the exported model is a drop-in for app.py
+    inputs = Input(shape=input_shape)
+    x = Lambda(lambda t: tf.gather(t, STUDENT_FEATURES, axis=-1), name='select_features')(inputs)
+
+    if STUDENT_TYPE == "dwconv":
+        x = Conv1D(64, 1, activation='relu')(x)
+        x = DepthwiseConv1D(5, padding='same', activation='relu')(x)
+        x = Conv1D(64, 1, activation='relu')(x)
+        x = DepthwiseConv1D(5, padding='same', activation='relu')(x)
+        x = GlobalAveragePooling1D()(x)
+    else:
+        # unroll=True keeps the GRU as plain ops in TFLite (no TensorList/While)
+        x = GRU(64, unroll=True)(x)
+
+    x = Dropout(0.2)(x)
+    logits = Dense(num_classes, name='logits')(x)
+    return Model(inputs, logits)
+
+
+class Distiller(Model):
+    """Trains the student on a mix of hard labels and tempered teacher targets."""
+
+    def __init__(self, student):
+        super().__init__()
+        self.student = student
+        self.kl = tf.keras.losses.KLDivergence()
+        self.ce = tf.keras.losses.CategoricalCrossentropy(from_logits=True)
+        self.acc = tf.keras.metrics.CategoricalAccuracy(name='categorical_accuracy')
+        self.loss_tracker = tf.keras.metrics.Mean(name='loss')
+
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.acc]
+
+    def _loss(self, y_hard, y_soft, logits):
+        student_soft = tf.nn.softmax(logits / TEMPERATURE)
+        # T^2 keeps the soft-target gradients on the same scale as the hard loss
+        distill = self.kl(y_soft, student_soft) * (TEMPERATURE ** 2)
+        hard = self.ce(y_hard, logits)
+        return ALPHA * hard + (1 - ALPHA) * distill
+
+    def train_step(self, data):
+        x, (y_hard, y_soft) = data
+        with tf.GradientTape() as tape:
+            logits = self.student(x, training=True)
+            loss = self._loss(y_hard, y_soft, logits)
+        grads = tape.gradient(loss, self.student.trainable_variables)
+        self.optimizer.apply_gradients(zip(grads, self.student.trainable_variables))
+        self.loss_tracker.update_state(loss)
+        self.acc.update_state(y_hard, logits)
+        return {m.name: m.result() for m in self.metrics}
+
+    def test_step(self, data):
+        x, (y_hard, y_soft) = data
+        logits = self.student(x, training=False)
+        self.loss_tracker.update_state(self._loss(y_hard, y_soft, logits))
+        self.acc.update_state(y_hard, logits)
+        return {m.name: m.result() for m in self.metrics}
+
+    def call(self, x):
+        return self.student(x)
+
+
+student = build_student(actions.shape[0])
+student.summary()
+
+distiller = Distiller(student)
+distiller.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=1e-3))
+print("✅ Distiller compiled successfully")
+
+early_stop = EarlyStopping(
+    monitor='val_loss', patience=30, restore_best_weights=True
+)
+
+print("🚀 Distillation started...\n")
+
+distiller.fit(
+    X_train, (y_train, soft_train),
+    epochs=300,
+    validation_data=(X_test, (y_test, soft_test)),
+    callbacks=[early_stop],
+    batch_size=16,
+    verbose=1
+)
+
+# Serve probabilities like the teacher does
+student_probs = Model(student.input, tf.keras.layers.Softmax()(student.output))
+
+os.makedirs('model', exist_ok=True)
+student_probs.save(STUDENT_PATH)
+print(f"\n✅ Student saved to {STUDENT_PATH}")
+
+# ===============================
+# Export student to TFLite
+# ===============================
+converter = tf.lite.TFLiteConverter.from_keras_model(student_probs)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+with open(STUDENT_TFLITE_PATH, 'wb') as f:
+    f.write(converter.convert())
+print(f"✅ Student exported to {STUDENT_TFLITE_PATH}")
+
+# ===============================
+# Accuracy vs latency vs size report
+# ===============================
+reports = {}
+if os.path.exists(TEACHER_TFLITE_PATH):
+    reports["teacher"] = benchmark_tflite(TEACHER_TFLITE_PATH, X_test, y_test)
+reports["student"] = benchmark_tflite(STUDENT_TFLITE_PATH, X_test, y_test)
+
+print("\n📊 Model comparison (TFLite, single sequence, CPU)")
+print(f"{'model':<10}{'accuracy':>10}{'p50 ms':>10}{'p95 ms':>10}{'size KB':>10}")
+for name, r in reports.items():
+    print(f"{name:<10}{r['accuracy']*100:>9.2f}%{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['size_kb']:>10.1f}")
+
+if "teacher" in reports and not held_out:
+    print("⚠️ Teacher accuracy is optimistic: no saved held-out split, see the warning above.")
+
+if "teacher" in reports:
+    t, s = reports["teacher"], reports["student"]
+    print(f"\n⚡ Speed-up: {t['p50_ms'] / s['p50_ms']:.1f}x | "
+          f"Size: {t['size_kb'] / s['size_kb']:.1f}x smaller | "
+          f"Accuracy delta: {(s['accuracy'] - t['accuracy'])*100:+.2f} pts")
+
+print(f"\n👉 To serve the student, start app.py with MODEL_PATH={STUDENT_TFLITE_PATH}")
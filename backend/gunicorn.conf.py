@@ -0,0 +1,37 @@
+import gc
+import os
+
+# Shared-memory serving mode:
+#   gunicorn -c gunicorn.conf.py app:app
+# preload_app imports app.py (TensorFlow/TFLite, MediaPipe, NumPy, OpenCV) once in the
+# parent and forks the workers from it, so that code and heap are shared copy-on-write
+# instead of being loaded again by every worker. The TFLite interpreter and the MediaPipe
+# Holistic graph are NOT shared: each worker builds its own on first use (see
+# get_process_local in app.py).
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 120
+
+
+def when_ready(server):
+    # Move everything preloaded into the permanent generation, so the children's garbage
+    # collections never walk (and write GC headers into) the shared pages; reference-count
+    # updates on objects a worker actually uses still copy those pages
+    gc.collect()
+    gc.freeze()
+
+
+def pre_fork(server, worker):
+    # Also covers objects the master allocated after when_ready (e.g. when respawning workers)
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # app.py's create_all() left a pooled SQLite connection in the parent; a SQLite connection
+    # must not be used across fork(), so each worker drops the inherited pool (without closing
+    # the parent's connection) and opens its own
+    import app
+    app.engine.dispose(close=False)
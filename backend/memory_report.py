@@ -0,0 +1,163 @@
+import io
+import os
+import signal
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+from PIL import Image
+
+# The report mints its own token for /predict/, so it and the servers it starts must share
+# a real SECRET_KEY (AUTH_DEV_MODE's random per-process key would not match)
+if not os.getenv("SECRET_KEY"):
+    raise SystemExit("❌ Set SECRET_KEY before running memory_report.py")
+
+from auth import create_access_token
+
+# ===============================
+# Memory per worker count (Linux only, reads /proc/<pid>/smaps_rollup)
+#   python memory_report.py            -> compares both modes for 1, 2 and 4 workers
+#   python memory_report.py 1 2 4 8
+# "uvicorn" = every worker imports app.py itself (current Procfile)
+# "preload" = gunicorn.conf.py, app.py imported once in the parent and forked
+# ===============================
+PORT = int(os.getenv("REPORT_PORT", "8765"))
+BASE_URL = f"http://127.0.0.1:{PORT}"
+STARTUP_TIMEOUT = 180
+WARMUP_REQUESTS_PER_WORKER = 4
+WARMUP_ROUNDS = 10
+# app.py's interpreter maps this file, so a worker that has it mapped has served /predict/
+MODEL_FILE = os.path.abspath(os.getenv("MODEL_PATH", "model_optimized.tflite"))
+
+COMMANDS = {
+    "uvicorn": lambda n: ["uvicorn", "app:app", "--host", "127.0.0.1", "--port", str(PORT), "--workers", str(n)],
+    "preload": lambda n: ["gunicorn", "-c", "gunicorn.conf.py", "--bind", f"127.0.0.1:{PORT}", "--workers", str(n), "app:app"],
+}
+
+
+def child_pids(root):
+    parents = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # ppid is the 2nd field after the ")" that closes the command name
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry))
+
+    pids, stack = [], [root]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(parents.get(pid, []))
+    return pids
+
+
+def memory_kb(pid):
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def pids_with_model(pids):
+    loaded = set()
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/maps") as f:
+                if MODEL_FILE in f.read():
+                    loaded.add(pid)
+        except OSError:
+            continue
+    return loaded
+
+
+def blank_jpeg():
+    buf = io.BytesIO()
+    Image.fromarray(np.zeros((480, 640, 3), dtype=np.uint8)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def wait_until_ready(proc):
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("❌ Server exited during startup")
+        try:
+            if requests.get(f"{BASE_URL}/docs", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError("❌ Server did not start in time")
+
+
+def warm_up(proc, workers):
+    image = blank_jpeg()
+    # The server inherits this process's SECRET_KEY, so it accepts the token we mint here
+    headers = {"Authorization": f"Bearer {create_access_token(0, 'memory_report')}"}
+
+    def post(_):
+        response = requests.post(f"{BASE_URL}/predict/", files={"file": ("frame.jpg", image, "image/jpeg")},
+                                 headers=headers, timeout=60)
+        # Anything else means the handler never ran and the workers never loaded their models
+        assert response.status_code == 200, f"❌ Warm-up request failed: {response.status_code} {response.text}"
+
+    # Concurrent bursts: a worker busy with a frame isn't accepting, so the others pick up
+    # connections. Repeat until every worker has loaded its interpreter (and its Holistic
+    # graph, built in the same request).
+    with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+        for _ in range(WARMUP_ROUNDS):
+            list(pool.map(post, range(WARMUP_REQUESTS_PER_WORKER * workers)))
+            loaded = pids_with_model(child_pids(proc.pid))
+            if len(loaded) >= workers:
+                return
+    print(f"⚠️ Only {len(loaded)}/{workers} workers loaded the model; the numbers below under-report memory")
+
+
+def measure(mode, workers):
+    proc = subprocess.Popen(COMMANDS[mode](workers), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(proc)
+        warm_up(proc, workers)
+        time.sleep(1)
+
+        totals = {"rss": 0, "pss": 0, "uss": 0}
+        for pid in child_pids(proc.pid):
+            try:
+                for key, value in memory_kb(pid).items():
+                    totals[key] += value
+            except OSError:
+                continue
+        return totals
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+
+if __name__ == "__main__":
+    worker_counts = [int(n) for n in sys.argv[1:]] or [1, 2, 4]
+
+    print(f"{'mode':<10}{'workers':>8}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'PSS/worker':>12}")
+    for mode in COMMANDS:
+        for n in worker_counts:
+            m = measure(mode, n)
+            print(f"{mode:<10}{n:>8}{m['rss']/1024:>10.1f}{m['pss']/1024:>10.1f}"
+                  f"{m['uss']/1024:>10.1f}{m['pss']/1024/n:>12.1f}")
+    print("\nPSS is the number to compare against the instance RAM limit: shared pages are split across processes.")
@@ -0,0 +1,205 @@
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# Per-client keypoint ring buffers for /predict/.
+# Frames are kept as float16 (1662 * 2 bytes ≈ 3.3 KB each) and expire after
+# SESSION_TTL seconds of inactivity. The backend is picked by SESSION_STORE_URL:
+#   (unset) / memory://  -> in-process dict (single worker only)
+#   redis://host:port/0  -> shared Redis, so every uvicorn worker/instance sees the same buffer
+#   local://             -> in-process stand-in speaking the same commands as Redis (for tests)
+
+SEQUENCE_LENGTH = 30
+NUM_FEATURES = 1662
+SESSION_TTL = int(os.getenv("SESSION_TTL", "60"))
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "1000"))
+STORAGE_DTYPE = np.float16
+
+
+class SessionStore(ABC):
+    @abstractmethod
+    def append(self, session_id, keypoints):
+        """Push one frame and return the session's current window (oldest first)."""
+
+    @abstractmethod
+    def get(self, session_id):
+        """Return the session's current window without modifying it."""
+
+    @abstractmethod
+    def clear(self, session_id):
+        """Drop the session's window."""
+
+    @staticmethod
+    def _decode(frames):
+        if not frames:
+            return np.zeros((0, NUM_FEATURES), dtype=np.float32)
+        return np.stack(frames).astype(np.float32)
+
+
+class InMemorySessionStore(SessionStore):
+    def __init__(self, maxlen=SEQUENCE_LENGTH, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS):
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> (last_seen, deque of frames), oldest first
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._sessions:
+            session_id, (last_seen, _) = next(iter(self._sessions.items()))
+            if now - last_seen < self.ttl:
+                break
+            del self._sessions[session_id]
+
+    def append(self, session_id, keypoints):
+        frame = np.asarray(keypoints, dtype=STORAGE_DTYPE)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            _, frames = self._sessions.pop(session_id, (now, None))
+            if frames is None:
+                frames = deque(maxlen=self.maxlen)
+            frames.append(frame)
+            self._sessions[session_id] = (now, frames)
+            # Bound memory even when clients rotate session ids faster than the TTL expires them
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return self._decode(list(frames))
+
+    def get(self, session_id):
+        with self._lock:
+            self._evict(time.monotonic())
+            entry = self._sessions.get(session_id)
+            return self._decode(list(entry[1]) if entry else [])
+
+    def clear(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        with self._lock:
+            self._evict(time.monotonic())
+            return len(self._sessions)
+
+
+class RedisSessionStore(SessionStore):
+    """Keeps each window as a Redis list of raw float16 frames, trimmed to the last N."""
+
+    def __init__(self, client, maxlen=SEQUENCE_LENGTH, ttl=SESSION_TTL, prefix="asl:seq:"):
+        self.client = client
+        self.maxlen = maxlen
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, session_id):
+        return f"{self.prefix}{session_id}"
+
+    def _frames(self, raw):
+        return [np.frombuffer(item, dtype=STORAGE_DTYPE) for item in raw]
+
+    def append(self, session_id, keypoints):
+        key = self._key(session_id)
+        frame = np.asarray(keypoints, dtype=STORAGE_DTYPE).tobytes()
+        # One round-trip per frame: push, trim, refresh TTL and read back the window
+        pipe = self.client.pipeline()
+        pipe.rpush(key, frame)
+        pipe.ltrim(key, -self.maxlen, -1)
+        pipe.expire(key, self.ttl)
+        pipe.lrange(key, 0, -1)
+        raw = pipe.execute()[-1]
+        return self._decode(self._frames(raw))
+
+    def get(self, session_id):
+        return self._decode(self._frames(self.client.lrange(self._key(session_id), 0, -1)))
+
+    def clear(self, session_id):
+        self.client.delete(self._key(session_id))
+
+
+class LocalRedis:
+    """Minimal in-process stand-in for the Redis commands RedisSessionStore uses."""
+
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+        self._lock = threading.Lock()
+
+    def _alive(self, key):
+        expires = self._expires.get(key)
+        if expires is not None and time.monotonic() >= expires:
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def rpush(self, key, *values):
+        with self._lock:
+            self._alive(key)
+            items = self._data.setdefault(key, [])
+            items.extend(bytes(v) for v in values)
+            return len(items)
+
+    def ltrim(self, key, start, end):
+        with self._lock:
+            if self._alive(key):
+                stop = None if end == -1 else end + 1
+                self._data[key] = self._data[key][start:stop]
+            return True
+
+    def lrange(self, key, start, end):
+        with self._lock:
+            if not self._alive(key):
+                return []
+            stop = None if end == -1 else end + 1
+            return list(self._data[key][start:stop])
+
+    def expire(self, key, seconds):
+        with self._lock:
+            if not self._alive(key):
+                return False
+            self._expires[key] = time.monotonic() + seconds
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            removed = 0
+            for key in keys:
+                removed += int(self._data.pop(key, None) is not None)
+                self._expires.pop(key, None)
+            return removed
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+
+class _LocalPipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        def queue(*args):
+            self._calls.append((method, args))
+            return self
+        return queue
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        return [method(*args) for method, args in calls]
+
+
+def create_session_store(url=None):
+    url = url if url is not None else os.getenv("SESSION_STORE_URL", "")
+    if not url or url.startswith("memory://"):
+        return InMemorySessionStore()
+    if url.startswith("local://"):
+        return RedisSessionStore(LocalRedis())
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        import redis  # only needed when a shared store is configured
+        return RedisSessionStore(redis.Redis.from_url(url))
+    raise ValueError(f"Unsupported SESSION_STORE_URL: {url}")
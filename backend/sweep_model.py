@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import itertools
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from sklearn.model_selection import train_test_split
+from tqdm import tqdm
+from training_utils import ACTIONS, load_dataset, benchmark_tflite, TFLITE_NUM_THREADS
+
+# ===============================
+# Sweep config
+#   python sweep_model.py                 -> NUM_PROCS worker processes
+#   SWEEP_PROCS=4 SWEEP_THREADS=2 python sweep_model.py
+#   TFLITE_NUM_THREADS=1 python sweep_model.py  -> benchmark with the server's interpreter threads
+# ===============================
+NUM_PROCS = int(os.getenv("SWEEP_PROCS", max(1, (os.cpu_count() or 2) // 2)))
+THREADS_PER_PROC = int(os.getenv("SWEEP_THREADS", max(1, (os.cpu_count() or 2) // NUM_PROCS)))
+EPOCHS = int(os.getenv("SWEEP_EPOCHS", "300"))
+RESULTS_PATH = "sweep_results.json"
+SWEEP_MODEL_DIR = os.path.join("model", "sweep")
+
+# Same architecture family as train_model.py; the first entry is its exact configuration
+SEARCH_SPACE = {
+    "conv_filters": [(128, 256), (64, 128), (32, 64)],
+    "lstm_units": [(128, 64), (64, 32)],
+    "dense_units": [128, 64],
+    "learning_rate": [1e-4, 1e-3],
+    "batch_size": [16, 32],
+}
+
+
+def to_shared(arrays):
+    """Copy each array into a named shared-memory block; returns the blocks and their specs."""
+    blocks, specs = [], {}
+    for name, array in arrays.items():
+        shm = shared_memory.SharedMemory(create=True, size=array.nbytes)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+        blocks.append(shm)
+        specs[name] = (shm.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+# ===============================
+# Worker process
+# ===============================
+_worker = {}
+
+
+def init_worker(specs, threads):
+    # Thread limits must be set before TensorFlow is imported in this process
+    for var in ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS"):
+        os.environ[var] = str(threads)
+    os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
+    os.environ["CUDA_VISIBLE_DEVICES"] = ""
+
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    # Attach to the parent's arrays without copying them
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker[f"{name}_shm"] = shm  # keep the mapping alive for the life of the worker
+        _worker[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _worker["threads"] = threads
+
+
+def build_model(config, num_classes):
+    from tensorflow.keras.models import Model
+    from tensorflow.keras.layers import LSTM, Dense, Dropout, BatchNormalization, Conv1D, MaxPooling1D, Input
+
+    inputs = Input(shape=(30, 1662))
+    x = inputs
+    for filters, dropout in zip(config["conv_filters"], (0.2, 0.3)):
+        x = Conv1D(filters, 3, activation='relu', padding='same')(x)
+        x = MaxPooling1D(2)(x)
+        x = BatchNormalization()(x)
+        x = Dropout(dropout)(x)
+
+    first, second = config["lstm_units"]
+    x = LSTM(first, return_sequences=True, activation='relu')(x)
+    x = BatchNormalization()(x)
+    x = Dropout(0.3)(x)
+
+    x = LSTM(second, return_sequences=False, activation='relu')(x)
+    x = BatchNormalization()(x)
+    x = Dropout(0.3)(x)
+
+    x = Dense(config["dense_units"], activation='relu')(x)
+    x = Dropout(0.3)(x)
+    outputs = Dense(num_classes, activation='softmax')(x)
+    return Model(inputs, outputs)
+
+
+def run_trial(args):
+    trial_id, config = args
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    X_train, y_train = _worker["X_train"], _worker["y_train"]
+    X_test, y_test = _worker["X_test"], _worker["y_test"]
+
+    tf.keras.utils.set_random_seed(42)
+    model = build_model(config, y_train.shape[1])
+    model.compile(
+        optimizer=tf.keras.optimizers.Adam(learning_rate=config["learning_rate"]),
+        loss='categorical_crossentropy',
+        metrics=['categorical_accuracy']
+    )
+
+    start = time.perf_counter()
+    history = model.fit(
+        X_train, y_train,
+        epochs=EPOCHS,
+        validation_data=(X_test, y_test),
+        callbacks=[EarlyStopping(monitor='val_loss', patience=30, restore_best_weights=True)],
+        batch_size=config["batch_size"],
+        verbose=0
+    )
+    train_time = time.perf_counter() - start
+    _, accuracy = model.evaluate(X_test, y_test, verbose=0)
+
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+
+    os.makedirs(SWEEP_MODEL_DIR, exist_ok=True)
+    tflite_path = os.path.join(SWEEP_MODEL_DIR, f"trial_{trial_id}.tflite")
+    with open(tflite_path, 'wb') as f:
+        f.write(tflite_model)
+
+    tf.keras.backend.clear_session()
+    # The exported .tflite's accuracy and latency are measured later in the parent, once no
+    # other trial is competing for the CPUs
+    return {
+        "trial": trial_id,
+        "config": {k: list(v) if isinstance(v, tuple) else v for k, v in config.items()},
+        "keras_accuracy": float(accuracy),
+        "train_time_s": train_time,
+        "epochs_run": len(history.history['loss']),
+        "tflite_path": tflite_path,
+    }
+
+
+# ===============================
+# Pareto front over the exported models: no other trial is at least as accurate AND at least as fast (and better in one)
+# ===============================
+def pareto_front(results):
+    front = []
+    for r in results:
+        dominated = any(
+            o["accuracy"] >= r["accuracy"] and o["latency_ms"] <= r["latency_ms"]
+            and (o["accuracy"] > r["accuracy"] or o["latency_ms"] < r["latency_ms"])
+            for o in results
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r["latency_ms"])
+
+
+if __name__ == "__main__":
+    actions = ACTIONS
+    X, y, _ = load_dataset(actions)
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    blocks, specs = to_shared({"X_train": X_train, "X_test": X_test, "y_train": y_train, "y_test": y_test})
+    del X, y, X_train, y_train  # the parent keeps only the test set, to score the exported models
+
+    keys = list(SEARCH_SPACE)
+    configs = [dict(zip(keys, values)) for values in itertools.product(*SEARCH_SPACE.values())]
+    if len(sys.argv) > 1:
+        configs = configs[:int(sys.argv[1])]  # optional cap on the number of trials
+    print(f"🚀 Running {len(configs)} trials on {NUM_PROCS} processes x {THREADS_PER_PROC} threads\n")
+
+    results = []
+    try:
+        # spawn: TensorFlow is not fork-safe, and each worker imports it after setting thread limits
+        ctx = mp.get_context("spawn")
+        with ctx.Pool(NUM_PROCS, initializer=init_worker, initargs=(specs, THREADS_PER_PROC),
+                      maxtasksperchild=1) as pool:
+            for result in tqdm(pool.imap_unordered(run_trial, enumerate(configs)), total=len(configs), desc="🔬 Trials"):
+                results.append(result)
+                print(f"  trial {result['trial']:>3}: keras acc={result['keras_accuracy']*100:.2f}% "
+                      f"train={result['train_time_s']:.0f}s")
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
+
+    # Benchmark the exported (quantized) models one after another on an idle machine, with the
+    # interpreter thread count the server uses. Accuracy also comes from the .tflite, since
+    # that is the file that would be shipped, so both Pareto axes describe the same model.
+    print(f"\n⏱️ Benchmarking {len(results)} models (threads={TFLITE_NUM_THREADS or 'default'})")
+    for result in tqdm(results, desc="⏱️ Benchmark"):
+        report = benchmark_tflite(result["tflite_path"], X_test, y_test)
+        result["accuracy"] = report["accuracy"]
+        result["latency_ms"] = report["p50_ms"]
+        result["latency_p95_ms"] = report["p95_ms"]
+        result["size_kb"] = report["size_kb"]
+
+    front = pareto_front(results)
+    with open(RESULTS_PATH, 'w') as f:
+        json.dump({"actions": actions.tolist(), "trials": sorted(results, key=lambda r: r["trial"]),
+                   "pareto": [r["trial"] for r in front]}, f, indent=2)
+    print(f"\n✅ Results saved to {RESULTS_PATH}")
+
+    print("\n🏆 Pareto-optimal candidates (accuracy vs. inference latency)")
+    print(f"{'trial':>6}{'tflite acc':>12}{'keras acc':>11}{'p50 ms':>9}{'size KB':>9}{'train s':>9}  config")
+    for r in front:
+        print(f"{r['trial']:>6}{r['accuracy']*100:>11.2f}%{r['keras_accuracy']*100:>10.2f}%"
+              f"{r['latency_ms']:>9.2f}{r['size_kb']:>9.1f}"
+              f"{r['train_time_s']:>9.0f}  {r['config']}")
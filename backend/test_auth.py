@@ -0,0 +1,166 @@
+import json
+import os
+import tempfile
+import time
+
+# auth.py reads its configuration at import time
+os.environ.setdefault("SECRET_KEY", "test_secret_key")
+os.environ["GOOGLE_CLIENT_ID"] = "test-client.apps.googleusercontent.com"
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
+from jose import jwk, jwt
+
+import auth
+from auth import GoogleKeySet, TokenCache, create_access_token, get_current_user, verify_access_token, verify_google_id_token
+
+# ===============================
+# Offline checks for access tokens and Google ID-token verification
+#   python test_auth.py   (or pytest test_auth.py)
+# Google's keys are replaced by throwaway RSA keys published through a JWKS file.
+# ===============================
+CLIENT_ID = os.environ["GOOGLE_CLIENT_ID"]
+
+
+def make_rsa_key(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public_pem = private.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = kid
+    return private_pem, public_jwk
+
+
+KEY_1 = make_rsa_key("key-1")
+KEY_2 = make_rsa_key("key-2")
+
+
+def write_jwks(path, *keys):
+    with open(path, "w") as f:
+        json.dump({"keys": [public for _, public in keys]}, f)
+
+
+def use_jwks(*keys, min_refresh_interval=60):
+    """Points auth at a fresh JWKS file and returns its path."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    write_jwks(path, *keys)
+    auth.google_keys = GoogleKeySet(path=path, min_refresh_interval=min_refresh_interval)
+    return path
+
+
+def google_token(key=KEY_1, **overrides):
+    private_pem, public = key
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": "1234567890",
+        "email": "signer@example.com",
+        "email_verified": True,
+        "name": "Test Signer",
+        "iat": now,
+        "exp": now + 3600,
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, private_pem, algorithm="RS256", headers={"kid": public["kid"]})
+
+
+def expect_status(status, fn, *args):
+    try:
+        fn(*args)
+    except HTTPException as e:
+        assert e.status_code == status, f"expected {status}, got {e.status_code}: {e.detail}"
+        return
+    raise AssertionError(f"expected HTTP {status}, call succeeded")
+
+
+# ===============================
+# Access tokens
+# ===============================
+def test_access_token_round_trip():
+    token = create_access_token(7, "signer")
+    claims = verify_access_token(token)
+    assert claims["sub"] == "7" and claims["username"] == "signer"
+    assert get_current_user(f"Bearer {token}")["sub"] == "7"
+
+
+def test_access_token_rejected():
+    expect_status(401, verify_access_token, create_access_token(7, "signer", expires_minutes=-1))
+    expect_status(401, verify_access_token, create_access_token(7, "signer") + "x")
+    expect_status(401, verify_access_token, "dummy_token_123")
+    expect_status(401, get_current_user, None)
+    expect_status(401, get_current_user, "Token abc")
+
+
+def test_token_cache():
+    cache = TokenCache(maxsize=2)
+    future = time.time() + 60
+    cache.put("a", {"exp": future})
+    cache.put("b", {"exp": future})
+    cache.get("a")  # "a" is now the most recently used
+    cache.put("c", {"exp": future})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    cache.put("old", {"exp": time.time() - 1})
+    assert cache.get("old") is None
+
+
+# ===============================
+# Google ID tokens
+# ===============================
+def test_google_token_accepted():
+    use_jwks(KEY_1)
+    claims = verify_google_id_token(google_token())
+    assert claims["email"] == "signer@example.com"
+    assert verify_google_id_token(google_token(iss="accounts.google.com"))["sub"] == "1234567890"
+
+
+def test_google_token_rejected():
+    use_jwks(KEY_1)
+    expect_status(401, verify_google_id_token, google_token(aud="someone-else"))
+    expect_status(401, verify_google_id_token, google_token(iss="https://evil.example.com"))
+    expect_status(401, verify_google_id_token, google_token(email_verified=False))
+    expect_status(401, verify_google_id_token, google_token(exp=int(time.time()) - 60))
+    expect_status(401, verify_google_id_token, "not-a-jwt")
+
+
+def test_google_token_signed_by_unpublished_key():
+    use_jwks(KEY_1)
+    # Same kid as a published key, different private key: the signature check must fail
+    forged = (KEY_2[0], KEY_1[1])
+    expect_status(401, verify_google_id_token, google_token(key=forged))
+
+
+def test_google_key_rotation():
+    path = use_jwks(KEY_1, min_refresh_interval=0)
+    verify_google_id_token(google_token())
+    # Google publishes key-2; a token with the new kid triggers a refresh instead of a 401
+    write_jwks(path, KEY_1, KEY_2)
+    assert verify_google_id_token(google_token(key=KEY_2))["email"] == "signer@example.com"
+
+
+def test_unknown_kid_is_not_refetched_within_interval():
+    path = use_jwks(KEY_1, min_refresh_interval=60)
+    verify_google_id_token(google_token())
+    write_jwks(path, KEY_1, KEY_2)
+    # Keys were fetched moments ago, so an unknown kid doesn't hammer the key endpoint
+    expect_status(401, verify_google_id_token, google_token(key=KEY_2))
+
+
+def test_google_keys_unavailable():
+    auth.google_keys = GoogleKeySet(path=os.path.join(tempfile.gettempdir(), "missing-jwks.json"))
+    expect_status(503, verify_google_id_token, google_token())
+
+
+if __name__ == "__main__":
+    for test in (test_access_token_round_trip, test_access_token_rejected, test_token_cache,
+                 test_google_token_accepted, test_google_token_rejected,
+                 test_google_token_signed_by_unpublished_key, test_google_key_rotation,
+                 test_unknown_kid_is_not_refetched_within_interval, test_google_keys_unavailable):
+        test()
+        print(f"✅ {test.__name__}")
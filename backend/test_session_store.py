@@ -0,0 +1,75 @@
+import time
+
+import numpy as np
+
+from session_store import InMemorySessionStore, LocalRedis, RedisSessionStore, NUM_FEATURES
+
+# ===============================
+# Runs both session-store backends through append / trim / TTL expiry
+#   python test_session_store.py   (or pytest test_session_store.py)
+# ===============================
+MAXLEN = 5
+
+
+def make_stores(ttl=60):
+    return {
+        "memory": InMemorySessionStore(maxlen=MAXLEN, ttl=ttl),
+        "local redis": RedisSessionStore(LocalRedis(), maxlen=MAXLEN, ttl=ttl),
+    }
+
+
+def frame(value):
+    return np.full(NUM_FEATURES, value, dtype=np.float32)
+
+
+def test_append_and_trim():
+    for name, store in make_stores().items():
+        for i in range(MAXLEN + 3):
+            window = store.append("a", frame(i))
+        assert window.shape == (MAXLEN, NUM_FEATURES), name
+        assert window.dtype == np.float32, name
+        # Only the last MAXLEN frames survive, oldest first
+        assert window[:, 0].tolist() == list(range(3, MAXLEN + 3)), name
+        assert np.array_equal(store.get("a"), window), name
+
+
+def test_sessions_are_isolated():
+    for name, store in make_stores().items():
+        store.append("a", frame(1))
+        store.append("b", frame(2))
+        assert store.get("a")[:, 0].tolist() == [1], name
+        assert store.get("b")[:, 0].tolist() == [2], name
+        store.clear("a")
+        assert store.get("a").shape == (0, NUM_FEATURES), name
+        assert len(store.get("b")) == 1, name
+
+
+def test_float16_storage():
+    for name, store in make_stores().items():
+        window = store.append("a", frame(0.123456789))
+        assert abs(window[0, 0] - 0.123456789) < 1e-3, name
+
+
+def test_ttl_expiry():
+    for name, store in make_stores(ttl=1).items():
+        store.append("a", frame(1))
+        time.sleep(1.1)
+        assert store.get("a").shape == (0, NUM_FEATURES), name
+        # A fresh append after expiry starts a new window
+        assert store.append("a", frame(2))[:, 0].tolist() == [2], name
+
+
+def test_max_sessions():
+    store = InMemorySessionStore(maxlen=MAXLEN, ttl=60, max_sessions=3)
+    for i in range(10):
+        store.append(f"s{i}", frame(i))
+    assert len(store) == 3
+    assert store.get("s0").shape == (0, NUM_FEATURES)
+    assert store.get("s9")[:, 0].tolist() == [9]
+
+
+if __name__ == "__main__":
+    for test in (test_append_and_trim, test_sessions_are_isolated, test_float16_storage,
+                 test_ttl_expiry, test_max_sessions):
+        test()
+        print(f"✅ {test.__name__}")
@@ -1,5 +1,5 @@
 from google.colab import files
-import os, zipfile
+import os, zipfile, json
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.model_selection import train_test_split
@@ -38,7 +38,7 @@ print(f"✅ Using data path: {DATA_PATH}")
 actions = np.array(os.listdir(DATA_PATH))
 print(f"🧩 Actions found: {actions}")
 
-sequences, labels = [], []
+sequences, labels, ids = [], [], []
 label_map = {label: num for num, label in enumerate(actions)}
 
 for action in tqdm(actions, desc="📂 Loading data"):
@@ -50,17 +50,24 @@ for action in tqdm(actions, desc="📂 Loading data"):
             window.append(res)
         sequences.append(window)
         labels.append(label_map[action])
+        ids.append(f"{action}/{sequence}")
 
 X = np.array(sequences)
 y = to_categorical(labels).astype(int)
 
 print(f"✅ Data loaded: X={X.shape}, y={y.shape}")
 
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.2, random_state=42
+X_train, X_test, y_train, y_test, ids_train, ids_test = train_test_split(
+    X, y, ids, test_size=0.2, random_state=42
 )
 print("✅ Train-test split complete")
 
+# Save the held-out sequences so distill_model.py scores this model only on data it never trained on
+os.makedirs('model', exist_ok=True)
+with open('model/test_split.json', 'w') as f:
+    json.dump({"test": ids_test}, f, indent=2)
+print("✅ Test split saved to model/test_split.json")
+
 input_shape = (30, 1662)
 
 inputs = Input(shape=input_shape)
@@ -0,0 +1,117 @@
+import os
+import json
+import time
+import numpy as np
+from sklearn.model_selection import train_test_split
+from tqdm import tqdm
+
+# Shared by distill_model.py and sweep_model.py so they load and benchmark the same way.
+
+# Fixed class order, identical to app.py: must not depend on os.listdir() order
+ACTIONS = np.array(['hello', 'thanks', 'iloveyou', 'yes', 'no'])
+SEQUENCE_LENGTH = 30
+# Written by train_model.py: the sequences the served model was evaluated on and never trained on
+TEST_SPLIT_PATH = os.path.join('model', 'test_split.json')
+
+# Same env var app.py passes to its interpreter; unset = TFLite's default
+TFLITE_NUM_THREADS = int(os.environ["TFLITE_NUM_THREADS"]) if os.getenv("TFLITE_NUM_THREADS") else None
+
+
+# ===============================
+# Dataset (MP_Data/<action>/<sequence>/<frame>.npy, as written by collect_data.py)
+# ===============================
+def find_data_path():
+    base_path = os.path.join(os.getcwd(), 'MP_Data')
+    if not os.path.exists(base_path):
+        raise FileNotFoundError("❌ MP_Data folder not found. Please upload and extract first.")
+
+    if not os.listdir(base_path) or 'MP_Data' in os.listdir(base_path):
+        base_path = os.path.join(base_path, 'MP_Data')
+    return base_path
+
+
+def load_dataset(actions=ACTIONS):
+    """Returns X (n, 30, 1662) float32, one-hot y (n, len(actions)) float32 and the
+    "<action>/<sequence>" id of every row."""
+    data_path = find_data_path()
+    print(f"✅ Using data path: {data_path}")
+
+    missing = [action for action in actions if not os.path.isdir(os.path.join(data_path, action))]
+    if missing:
+        raise FileNotFoundError(f"❌ MP_Data is missing folders for: {missing}")
+    print(f"🧩 Actions: {actions}")
+
+    sequences, labels, ids = [], [], []
+    label_map = {label: num for num, label in enumerate(actions)}
+
+    for action in tqdm(actions, desc="📂 Loading data"):
+        action_path = os.path.join(data_path, action)
+        for sequence in sorted(os.listdir(action_path)):
+            window = []
+            for frame_num in range(SEQUENCE_LENGTH):
+                window.append(np.load(os.path.join(action_path, sequence, f"{frame_num}.npy")))
+            sequences.append(window)
+            labels.append(label_map[action])
+            ids.append(f"{action}/{sequence}")
+
+    X = np.array(sequences, dtype=np.float32)
+    y = np.eye(len(actions), dtype=np.float32)[labels]
+    print(f"✅ Data loaded: X={X.shape}, y={y.shape}")
+    return X, y, ids
+
+
+def split_dataset(X, y, ids, split_path=TEST_SPLIT_PATH):
+    """Train/test split that reuses train_model.py's held-out sequences when they were saved.
+
+    Returns X_train, X_test, y_train, y_test and whether the saved split was used. Without
+    it, a fresh 80/20 split is made, and part of its test set was likely in the served
+    model's training data.
+    """
+    if os.path.exists(split_path):
+        with open(split_path) as f:
+            held_out = set(json.load(f)["test"])
+        test_mask = np.array([i in held_out for i in ids])
+        if test_mask.any():
+            return X[~test_mask], X[test_mask], y[~test_mask], y[test_mask], True
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    return X_train, X_test, y_train, y_test, False
+
+
+# ===============================
+# TFLite benchmark (single sequence, CPU)
+# ===============================
+def benchmark_tflite(path, X_eval, y_eval=None, runs=200, num_threads=TFLITE_NUM_THREADS):
+    """Accuracy (when labels are given), p50/p95 latency in ms and file size of a .tflite model."""
+    import tensorflow as tf
+
+    interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+    interpreter.allocate_tensors()
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+
+    report = {"size_kb": os.path.getsize(path) / 1024}
+
+    if y_eval is not None:
+        correct = 0
+        for sample, label in zip(X_eval, y_eval):
+            interpreter.set_tensor(input_index, sample[None].astype(np.float32))
+            interpreter.invoke()
+            correct += int(np.argmax(interpreter.get_tensor(output_index)) == np.argmax(label))
+        report["accuracy"] = correct / len(X_eval)
+
+    sample = np.ascontiguousarray(X_eval[:1], dtype=np.float32)
+    for _ in range(10):  # warm-up
+        interpreter.set_tensor(input_index, sample)
+        interpreter.invoke()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        interpreter.set_tensor(input_index, sample)
+        interpreter.invoke()
+        interpreter.get_tensor(output_index)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    report["p50_ms"] = float(np.percentile(timings, 50))
+    report["p95_ms"] = float(np.percentile(timings, 95))
+    return report
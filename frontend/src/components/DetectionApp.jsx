@@ -1,14 +1,26 @@
 import React, { useRef, useState, useCallback, useEffect } from "react";
 import Webcam from "react-webcam";
 import axios from "axios";
+import { useNavigate } from "react-router-dom";
 import "../styles/DetectionApp.css"; // ✅ New CSS file
 
+// One id per browser tab, so the backend can keep this tab's frames in their own sequence window
+const getSessionId = () => {
+  let id = sessionStorage.getItem("sessionId");
+  if (!id) {
+    id = crypto.randomUUID();
+    sessionStorage.setItem("sessionId", id);
+  }
+  return id;
+};
+
 function DetectionApp() {
+  const navigate = useNavigate();
   const webcamRef = useRef(null);
+  const intervalRef = useRef(null);
   const [gesture, setGesture] = useState("");
   const [confidence, setConfidence] = useState(null);
   const [detecting, setDetecting] = useState(false);
-  const [intervalId, setIntervalId] = useState(null);
   const [language, setLanguage] = useState("en-IN");
   const [translated, setTranslated] = useState("");
 
@@ -25,7 +37,13 @@ function DetectionApp() {
     try {
       const res = await axios.post(
         "https://asl-final-project.onrender.com/predict/",
-        formData
+        formData,
+        {
+          headers: {
+            Authorization: `Bearer ${localStorage.getItem("token")}`,
+            "X-Session-Id": getSessionId(),
+          },
+        }
       );
 
       const detectedGesture = res.data.prediction;
@@ -33,21 +51,33 @@ function DetectionApp() {
       setConfidence((res.data.confidence * 100).toFixed(2));
     } catch (err) {
       console.error("Prediction error:", err);
+      // Missing, legacy or expired token: stop polling and send the user back to login
+      if (err.response?.status === 401) {
+        clearInterval(intervalRef.current);
+        intervalRef.current = null;
+        setDetecting(false);
+        localStorage.removeItem("token");
+        localStorage.removeItem("user");
+        alert("Your session has expired. Please log in again.");
+        navigate("/login");
+      }
     }
-  }, []);
+  }, [navigate]);
 
   const startDetection = () => {
     if (detecting) return;
     setDetecting(true);
-    const id = setInterval(captureFrame, 5000);
-    setIntervalId(id);
+    intervalRef.current = setInterval(captureFrame, 5000);
   };
 
   const stopDetection = () => {
-    clearInterval(intervalId);
+    clearInterval(intervalRef.current);
+    intervalRef.current = null;
     setDetecting(false);
   };
 
+  useEffect(() => () => clearInterval(intervalRef.current), []);
+
   const speakGesture = () => {
     if (!gesture) return;
     const utterance = new SpeechSynthesisUtterance(translated || gesture);
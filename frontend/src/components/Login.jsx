@@ -58,13 +58,13 @@ const Login = () => {
         return;
       }
 
-      console.log("📤 Sending to backend:", { email, name });
+      console.log("📤 Sending Google credential to backend for", email);
 
+      // The backend verifies the signed ID token itself instead of trusting email/name
       const res = await axios.post(
         "https://asl-final-project.onrender.com/auth/google",
         {
-          email,
-          name,
+          credential: credentialResponse.credential,
         }
       );
 
@@ -72,7 +72,7 @@ const Login = () => {
 
       const data = res.data;
       alert("Google Login Successful!");
-      localStorage.setItem("token", "google");
+      localStorage.setItem("token", data.access_token);
       localStorage.setItem("user", JSON.stringify({ username: data.user }));
       navigate("/");
     } catch (err) {
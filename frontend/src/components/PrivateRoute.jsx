@@ -1,9 +1,25 @@
 import React from "react";
 import { Navigate } from "react-router-dom";
+import { jwtDecode } from "jwt-decode";
+
+// Rejects missing, legacy ("dummy_token_123", "google") and expired tokens up front
+const isTokenValid = (token) => {
+  if (!token) return false;
+  try {
+    const { exp } = jwtDecode(token);
+    return !exp || exp * 1000 > Date.now();
+  } catch {
+    return false;
+  }
+};
 
 const PrivateRoute = ({ children }) => {
   const token = localStorage.getItem("token");
-  if (!token) return <Navigate to="/login" replace />;
+  if (!isTokenValid(token)) {
+    localStorage.removeItem("token");
+    localStorage.removeItem("user");
+    return <Navigate to="/login" replace />;
+  }
   return children;
 };
 